@@ -3,19 +3,19 @@ Azkar Counter Bot
 Interactive Telegram bot with counting buttons for Islamic remembrances
 """
 
-import telebot
+import asyncio
+from telebot.async_telebot import AsyncTeleBot
 from telebot import types
 import json
 import os
-import time
 from logger_config import setup_logger
 
 logger = setup_logger()
 
 class AzkarCounter:
-    def __init__(self, bot_token):
-        """Initialize the azkar counter bot"""
-        self.bot = telebot.TeleBot(bot_token)
+    def __init__(self, bot):
+        """Initialize the azkar counter with a shared AsyncTeleBot"""
+        self.bot = bot
         self.user_counts = {}  # Store user counting data
         
         # Azkar types with their Arabic names and recommended counts
@@ -57,33 +57,31 @@ class AzkarCounter:
                 'recommended': 10
             }
         }
-        
-        self.setup_handlers()
     
     def setup_handlers(self):
-        """Setup message and callback handlers"""
+        """Setup message and callback handlers (standalone mode only)"""
         
         @self.bot.message_handler(commands=['start'])
-        def start_message(message):
-            self.send_welcome(message)
+        async def start_message(message):
+            await self.send_welcome(message)
         
         @self.bot.message_handler(commands=['azkar', 'اذكار'])
-        def azkar_menu(message):
-            self.send_azkar_menu(message)
+        async def azkar_menu(message):
+            await self.send_azkar_menu(message)
         
         @self.bot.message_handler(commands=['count', 'عد'])
-        def show_counts(message):
-            self.show_user_counts(message)
+        async def show_counts(message):
+            await self.show_user_counts(message)
         
         @self.bot.message_handler(commands=['reset', 'مسح'])
-        def reset_counts(message):
-            self.reset_user_counts(message)
+        async def reset_counts(message):
+            await self.reset_user_counts(message)
         
         @self.bot.callback_query_handler(func=lambda call: True)
-        def callback_handler(call):
-            self.handle_callback(call)
+        async def callback_handler(call):
+            await self.handle_callback(call)
     
-    def send_welcome(self, message):
+    async def send_welcome(self, message):
         """Send welcome message with instructions"""
         welcome_text = """
 🕌 مرحباً بك في حاسبة الأذكار الإسلامية
@@ -96,9 +94,9 @@ class AzkarCounter:
 
 ✨ ابدأ بالضغط على /azkar لاختيار الذكر
         """
-        self.bot.send_message(message.chat.id, welcome_text)
+        await self.bot.send_message(message.chat.id, welcome_text)
     
-    def send_azkar_menu(self, message):
+    async def send_azkar_menu(self, message):
         """Send azkar selection menu"""
         markup = types.InlineKeyboardMarkup(row_width=1)
         
@@ -110,14 +108,14 @@ class AzkarCounter:
         text = "🔹 اختر الذكر الذي تريد عده:\n\n"
         text += "الأرقام بين القوسين تشير للعدد المستحب"
         
-        self.bot.send_message(message.chat.id, text, reply_markup=markup)
+        await self.bot.send_message(message.chat.id, text, reply_markup=markup)
     
-    def show_user_counts(self, message):
+    async def show_user_counts(self, message):
         """Show current user counts"""
         user_id = str(message.from_user.id)
         
         if user_id not in self.user_counts or not self.user_counts[user_id]:
-            self.bot.send_message(message.chat.id, "📊 لم تبدأ العد بعد\n\nاستخدم /azkar لبدء العد")
+            await self.bot.send_message(message.chat.id, "📊 لم تبدأ العد بعد\n\nاستخدم /azkar لبدء العد")
             return
         
         text = "📊 عدادك الحالي:\n\n"
@@ -128,9 +126,9 @@ class AzkarCounter:
                 progress = f"({count}/{azkar_info['recommended']})"
                 text += f"📿 {azkar_info['arabic']}: {count} {progress}\n"
         
-        self.bot.send_message(message.chat.id, text)
+        await self.bot.send_message(message.chat.id, text)
     
-    def reset_user_counts(self, message):
+    async def reset_user_counts(self, message):
         """Reset user counts"""
         user_id = str(message.from_user.id)
         self.user_counts[user_id] = {}
@@ -138,13 +136,13 @@ class AzkarCounter:
         markup = types.InlineKeyboardMarkup()
         markup.add(types.InlineKeyboardButton("🔄 ابدأ العد مرة أخرى", callback_data="menu"))
         
-        self.bot.send_message(
+        await self.bot.send_message(
             message.chat.id, 
             "✅ تم مسح العداد بنجاح\n\n🔄 يمكنك البدء من جديد", 
             reply_markup=markup
         )
     
-    def handle_callback(self, call):
+    async def handle_callback(self, call):
         """Handle inline keyboard callbacks"""
         user_id = str(call.from_user.id)
         
@@ -154,27 +152,27 @@ class AzkarCounter:
         
         if call.data == "menu":
             # Go back to azkar menu
-            self.edit_to_azkar_menu(call)
+            await self.edit_to_azkar_menu(call)
         
         elif call.data.startswith("select_"):
             # Select azkar type
             azkar_key = call.data.replace("select_", "")
-            self.start_counting(call, azkar_key)
+            await self.start_counting(call, azkar_key)
         
         elif call.data.startswith("count_"):
             # Count button pressed
             azkar_key = call.data.replace("count_", "")
-            self.increment_count(call, azkar_key)
+            await self.increment_count(call, azkar_key)
         
         elif call.data.startswith("reset_"):
             # Reset specific azkar
             azkar_key = call.data.replace("reset_", "")
-            self.reset_specific_azkar(call, azkar_key)
+            await self.reset_specific_azkar(call, azkar_key)
         
         # Answer callback to remove loading
-        self.bot.answer_callback_query(call.id)
+        await self.bot.answer_callback_query(call.id)
     
-    def edit_to_azkar_menu(self, call):
+    async def edit_to_azkar_menu(self, call):
         """Edit message to show azkar menu"""
         markup = types.InlineKeyboardMarkup(row_width=1)
         
@@ -186,14 +184,14 @@ class AzkarCounter:
         text = "🔹 اختر الذكر الذي تريد عده:\n\n"
         text += "الأرقام بين القوسين تشير للعدد المستحب"
         
-        self.bot.edit_message_text(
+        await self.bot.edit_message_text(
             text, 
             call.message.chat.id, 
             call.message.message_id, 
             reply_markup=markup
         )
     
-    def start_counting(self, call, azkar_key):
+    async def start_counting(self, call, azkar_key):
         """Start counting for specific azkar"""
         user_id = str(call.from_user.id)
         azkar_info = self.azkar_types[azkar_key]
@@ -231,14 +229,14 @@ class AzkarCounter:
         text += f"📊 التقدم: {progress}\n\n"
         text += "👆 اضغط على الزر أدناه لبدء العد"
         
-        self.bot.edit_message_text(
+        await self.bot.edit_message_text(
             text, 
             call.message.chat.id, 
             call.message.message_id, 
             reply_markup=markup
         )
     
-    def increment_count(self, call, azkar_key):
+    async def increment_count(self, call, azkar_key):
         """Increment count for specific azkar"""
         user_id = str(call.from_user.id)
         azkar_info = self.azkar_types[azkar_key]
@@ -278,7 +276,7 @@ class AzkarCounter:
         text += "👆 استمر في الضغط للعد"
         
         try:
-            self.bot.edit_message_text(
+            await self.bot.edit_message_text(
                 text, 
                 call.message.chat.id, 
                 call.message.message_id, 
@@ -288,23 +286,23 @@ class AzkarCounter:
             # If edit fails (same content), just log
             logger.debug(f"Edit message failed: {e}")
     
-    def reset_specific_azkar(self, call, azkar_key):
+    async def reset_specific_azkar(self, call, azkar_key):
         """Reset count for specific azkar"""
         user_id = str(call.from_user.id)
         self.user_counts[user_id][azkar_key] = 0
         
         # Restart counting interface
-        self.start_counting(call, azkar_key)
+        await self.start_counting(call, azkar_key)
     
-    def start_polling(self):
+    async def start_polling(self):
         """Start the bot polling - NEVER STOPS"""
         logger.info("🔢 Starting Azkar Counter Bot...")
         while True:
             try:
-                self.bot.polling(none_stop=True, interval=0, timeout=20)
+                await self.bot.polling(non_stop=True, interval=0, timeout=25, request_timeout=40)
             except Exception as e:
                 logger.error(f"❌ Azkar Counter Bot error: {e} - restarting in 30 seconds...")
-                time.sleep(30)
+                await asyncio.sleep(30)
                 continue
 
 def main():
@@ -316,8 +314,9 @@ def main():
         logger.error("❌ TELEGRAM_BOT_TOKEN not found")
         return
     
-    counter = AzkarCounter(config.telegram_token)
-    counter.start_polling()
+    counter = AzkarCounter(AsyncTeleBot(config.telegram_token))
+    counter.setup_handlers()
+    asyncio.run(counter.start_polling())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -20,6 +20,8 @@ class BotConfig:
         self.content_temperature = float(os.getenv("CONTENT_TEMPERATURE", "0.8"))
         self.retry_attempts = int(os.getenv("RETRY_ATTEMPTS", "3"))
         self.retry_delay = int(os.getenv("RETRY_DELAY", "60"))
+        self.polling_timeout = int(os.getenv("POLLING_TIMEOUT", "25"))
+        self.keep_alive = os.getenv("KEEP_ALIVE", "true").lower() == "true"
         
         # Schedule configuration (24-hour format)
         self.schedule_config = {
@@ -71,4 +73,7 @@ class BotConfig:
         logger.info(f"   Max Content Length: {self.max_content_length}")
         logger.info(f"   Content Temperature: {self.content_temperature}")
         logger.info(f"   Retry Attempts: {self.retry_attempts}")
+        logger.info(f"   Retry Delay: {self.retry_delay}")
+        logger.info(f"   Polling Timeout: {self.polling_timeout}")
+        logger.info(f"   Keep Alive: {self.keep_alive}")
         logger.info(f"   Schedule Times: {self.schedule_config}")
@@ -3,76 +3,66 @@ Combined Bot Handler
 Handles both scheduled content posting and interactive azkar counter
 """
 
+import asyncio
 import threading
-import time
-import telebot
-from telebot import types
+from telebot import asyncio_helper
+from telebot.async_telebot import ExceptionHandler
+from telebot import types, util
 from logger_config import setup_logger
 
 logger = setup_logger()
 
+# Static part of the /schedule message
+_SCHEDULE_HEADER = (
+    "📅 جدول النشر التلقائي:\n\n"
+    "🌅 أذكار الصباح: 06:00\n"
+    "📖 آية قرآنية: 08:00\n"
+    "📚 حديث شريف: 12:00\n"
+    "💭 تذكرة إيمانية: 17:00\n"
+    "🤲 دعاء مستجاب: 20:00\n"
+    "🌙 أذكار المساء: 21:00\n\n"
+)
+
+class LongPollTimeoutHandler(ExceptionHandler):
+    """Treat getUpdates long-poll expirations as expected, not as errors"""
+
+    def handle(self, exception):
+        return isinstance(exception, asyncio_helper.RequestTimeout)
+
 class CombinedBotHandler:
-    def __init__(self, bot_token, channel_id, scheduler, azkar_counter):
-        """Initialize combined bot handler"""
-        self.bot = telebot.TeleBot(bot_token)
+    def __init__(self, bot, channel_id, scheduler, azkar_counter, loop, polling_timeout=25):
+        """Initialize combined bot handler with a shared AsyncTeleBot and the event loop that runs it"""
+        self.bot = bot
         self.channel_id = channel_id
+        self.loop = loop
+        self.polling_timeout = polling_timeout
+        self._polling_future = None
         self.scheduler = scheduler
         self.azkar_counter = azkar_counter
         self.running = False
+        self._scheduler_stop = threading.Event()  # Never set today - the bot never stops
+        
+        # Static messages and keyboards are identical for every user
+        self._build_static_messages()
         
         # Setup message handlers
         self.setup_handlers()
     
-    def setup_handlers(self):
-        """Setup bot command handlers"""
-        
-        @self.bot.message_handler(commands=['start'])
-        def start_command(message):
-            self.send_main_menu(message)
-        
-        @self.bot.message_handler(commands=['menu', 'القائمة'])
-        def menu_command(message):
-            self.send_main_menu(message)
-        
-        @self.bot.message_handler(commands=['azkar', 'اذكار'])
-        def azkar_command(message):
-            self.send_azkar_menu(message)
-        
-        @self.bot.message_handler(commands=['count', 'عد'])
-        def count_command(message):
-            self.azkar_counter.show_user_counts(message)
-        
-        @self.bot.message_handler(commands=['reset', 'مسح'])
-        def reset_command(message):
-            self.azkar_counter.reset_user_counts(message)
-        
-        @self.bot.message_handler(commands=['schedule', 'جدول'])
-        def schedule_command(message):
-            self.show_schedule(message)
-        
-        @self.bot.message_handler(commands=['help', 'مساعدة'])
-        def help_command(message):
-            self.send_help(message)
-        
-        # Use azkar_counter's callback handler
-        @self.bot.callback_query_handler(func=lambda call: True)
-        def callback_handler(call):
-            self.azkar_counter.handle_callback(call)
-    
-    def send_main_menu(self, message):
-        """Send main bot menu"""
-        markup = types.InlineKeyboardMarkup(row_width=2)
+    def _build_static_messages(self):
+        """Build the static menu texts and keyboards once, reused for every user"""
+        # Main menu
+        self._main_menu_markup = types.InlineKeyboardMarkup(row_width=2)
         
         # Main features
         azkar_btn = types.InlineKeyboardButton("📿 حاسبة الأذكار", callback_data="menu")
         schedule_btn = types.InlineKeyboardButton("📅 جدول النشر", callback_data="schedule")
-        markup.add(azkar_btn, schedule_btn)
+        self._main_menu_markup.add(azkar_btn, schedule_btn)
         
         # Additional options
         help_btn = types.InlineKeyboardButton("❓ المساعدة", callback_data="help")
-        markup.add(help_btn)
+        self._main_menu_markup.add(help_btn)
         
-        welcome_text = """
+        self._welcome_text = """
 🕌 مرحباً بك في بوت المحتوى الإسلامي
 
 🤖 هذا البوت يقدم لك:
@@ -85,35 +75,8 @@ class CombinedBotHandler:
 اختر ما تريد من القائمة أدناه:
         """
         
-        self.bot.send_message(message.chat.id, welcome_text, reply_markup=markup)
-    
-    def send_azkar_menu(self, message):
-        """Send azkar counter menu"""
-        self.azkar_counter.send_azkar_menu(message)
-    
-    def show_schedule(self, message):
-        """Show current posting schedule"""
-        schedule_info = self.scheduler.get_schedule_status()
-        
-        text = "📅 جدول النشر التلقائي:\n\n"
-        text += "🌅 أذكار الصباح: 06:00\n"
-        text += "📖 آية قرآنية: 08:00\n"
-        text += "📚 حديث شريف: 12:00\n"
-        text += "💭 تذكرة إيمانية: 17:00\n"
-        text += "🤲 دعاء مستجاب: 20:00\n"
-        text += "🌙 أذكار المساء: 21:00\n\n"
-        
-        text += "📊 حالة الجدولة:\n"
-        for info in schedule_info:
-            text += f"• {info}\n"
-        
-        text += "\n🔄 البوت ينشر المحتوى تلقائياً حسب الجدول أعلاه"
-        
-        self.bot.send_message(message.chat.id, text)
-    
-    def send_help(self, message):
-        """Send help information"""
-        help_text = """
+        # Help
+        self._help_text = """
 ❓ تعليمات استخدام البوت:
 
 📿 حاسبة الأذكار:
@@ -133,26 +96,88 @@ class CombinedBotHandler:
 🤖 البوت يعمل على مدار الساعة لخدمتك
         """
         
-        markup = types.InlineKeyboardMarkup()
-        markup.add(types.InlineKeyboardButton("🏠 القائمة الرئيسية", callback_data="main_menu"))
+        self._help_markup = types.InlineKeyboardMarkup()
+        self._help_markup.add(types.InlineKeyboardButton("🏠 القائمة الرئيسية", callback_data="main_menu"))
+    
+    def setup_handlers(self):
+        """Setup bot command handlers"""
+        
+        # Map every command (without the leading '/') to its handler
+        command_dispatch = {
+            'start': self.send_main_menu,
+            'menu': self.send_main_menu,
+            'القائمة': self.send_main_menu,
+            'azkar': self.send_azkar_menu,
+            'اذكار': self.send_azkar_menu,
+            'count': self.azkar_counter.show_user_counts,
+            'عد': self.azkar_counter.show_user_counts,
+            'reset': self.azkar_counter.reset_user_counts,
+            'مسح': self.azkar_counter.reset_user_counts,
+            'schedule': self.show_schedule,
+            'جدول': self.show_schedule,
+            'help': self.send_help,
+            'مساعدة': self.send_help
+        }
+        
+        # Single handler with a dict lookup instead of one handler per command
+        @self.bot.message_handler(func=lambda message: util.extract_command(message.text) in command_dispatch)
+        async def command_handler(message):
+            await command_dispatch[util.extract_command(message.text)](message)
+        
+        # Use azkar_counter's callback handler
+        @self.bot.callback_query_handler(func=lambda call: True)
+        async def callback_handler(call):
+            await self.azkar_counter.handle_callback(call)
+    
+    async def send_main_menu(self, message):
+        """Send main bot menu"""
+        await self.bot.send_message(message.chat.id, self._welcome_text, reply_markup=self._main_menu_markup)
+    
+    async def send_azkar_menu(self, message):
+        """Send azkar counter menu"""
+        await self.azkar_counter.send_azkar_menu(message)
+    
+    async def show_schedule(self, message):
+        """Show current posting schedule"""
+        schedule_info = self.scheduler.get_schedule_status()
+        
+        lines = ["📊 حالة الجدولة:"]
+        lines.extend(f"• {info}" for info in schedule_info)
+        lines.append("")
+        lines.append("🔄 البوت ينشر المحتوى تلقائياً حسب الجدول أعلاه")
+        text = _SCHEDULE_HEADER + "\n".join(lines)
         
-        self.bot.send_message(message.chat.id, help_text, reply_markup=markup)
+        await self.bot.send_message(message.chat.id, text)
+    
+    async def send_help(self, message):
+        """Send help information"""
+        await self.bot.send_message(message.chat.id, self._help_text, reply_markup=self._help_markup)
     
     def start_bot_polling(self):
-        """Start bot polling in a separate thread - NEVER STOPS"""
-        def bot_polling():
+        """Start bot polling on the shared event loop - NEVER STOPS"""
+        # Polling is already running if start() is being retried
+        if self._polling_future is not None and not self._polling_future.done():
+            logger.info("✅ Interactive bot already running")
+            return
+        
+        async def bot_polling():
             logger.info("🤖 Starting interactive bot polling...")
             while True:
                 try:
-                    self.bot.polling(none_stop=True, interval=0, timeout=20)
+                    # Long-poll timeout plus a 15s buffer for the HTTP round-trip
+                    await self.bot.polling(
+                        non_stop=True,
+                        interval=0,
+                        timeout=self.polling_timeout,
+                        request_timeout=self.polling_timeout + 15
+                    )
                 except Exception as e:
                     logger.error(f"❌ Bot polling error: {e} - restarting in 30 seconds...")
-                    time.sleep(30)
+                    await asyncio.sleep(30)
                     continue
         
-        # Start bot polling in separate thread
-        bot_thread = threading.Thread(target=bot_polling, daemon=True)
-        bot_thread.start()
+        # All Telegram API calls of the interactive bot and the keep-alive server share this single event loop
+        self._polling_future = asyncio.run_coroutine_threadsafe(bot_polling(), self.loop)
         logger.info("✅ Interactive bot started successfully")
     
     def start_scheduler(self):
@@ -161,15 +186,26 @@ class CombinedBotHandler:
         self.scheduler.setup_schedule()
         
         # Run scheduler forever - ignore stop requests
-        while True:
+        error_delay = 1
+        while not self._scheduler_stop.is_set():
             try:
-                self.scheduler.run_pending_tasks()
-                time.sleep(30)  # Check every 30 seconds
+                # Run due jobs, then wait exactly until the next one (or a stop request)
+                idle = self.scheduler.run_pending_tasks()
+                self._scheduler_stop.wait(timeout=idle if idle is not None else 30)
+                error_delay = 1
             except Exception as e:
-                logger.error(f"❌ Scheduler error: {e} - continuing...")
-                time.sleep(60)  # Wait longer on error
+                logger.error(f"❌ Scheduler error: {e} - retrying in {error_delay} seconds...")
+                self._scheduler_stop.wait(timeout=error_delay)
+                error_delay = min(error_delay * 2, 60)  # Back off exponentially on repeated errors
                 continue
     
+    def start_scheduler_in_thread(self):
+        """Start the content scheduler in a separate thread and return the thread"""
+        scheduler_thread = threading.Thread(target=self.start_scheduler, daemon=True)
+        scheduler_thread.start()
+        logger.info("✅ Content scheduler started successfully")
+        return scheduler_thread
+    
     def stop(self):
         """Stop the bot handler - IGNORED! Bot never stops"""
         logger.info("📶 Stop request ignored - Bot will continue running!")
@@ -1,21 +1,19 @@
 
-from flask import Flask
-from threading import Thread
+from aiohttp import web
 import socket
 
-app = Flask('')
+async def home(request):
+    return web.Response(text="أنا شغال تمام 😎")
 
-@app.route('/')
-def home():
-    return "أنا شغال تمام 😎"
-
-def run():
-    app.run(host='0.0.0.0', port=8080)
-
-def keep_alive():
+async def keep_alive(host='0.0.0.0', port=8080):
     # عرض رابط الريبل
     hostname = socket.gethostname()
     print("الرابط: https://" + hostname + ".repl.co")
     
-    t = Thread(target=run)
-    t.start()
+    # يعمل على نفس حلقة الأحداث الخاصة بالبوت بدلاً من خيط منفصل
+    app = web.Application()
+    app.router.add_get('/', home)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
@@ -4,12 +4,17 @@ Islamic Telegram Bot - Main Entry Point
 Automated bot that generates and posts Islamic religious content throughout the day
 """
 
+import asyncio
 import os
 import sys
 import time
 import signal
+import threading
 from datetime import datetime
 
+import telebot
+from telebot.async_telebot import AsyncTeleBot
+
 from keep_alive import keep_alive
 from logger_config import setup_logger
 from bot_config import BotConfig
@@ -17,27 +22,45 @@ from scheduler import ContentScheduler
 from telegram_bot import TelegramBot
 from content_generator import IslamicContentGenerator
 from azkar_counter import AzkarCounter
-from bot_handler import CombinedBotHandler
+from bot_handler import CombinedBotHandler, LongPollTimeoutHandler
 
 # Setup logging
 logger = setup_logger()
 
 class IslamicTelegramBot:
-    def __init__(self):
-        """Initialize the Islamic Telegram Bot"""
+    def __init__(self, loop):
+        """Initialize the Islamic Telegram Bot on the given event loop"""
         self.config = BotConfig()
-        self.telegram_bot = TelegramBot(self.config.telegram_token, self.config.channel_id)
+        
+        # One bot per transport: channel posts from the scheduler thread use the
+        # synchronous bot (send-only, so no update worker pool), while all
+        # interactive handlers share a single AsyncTeleBot and a single polling loop
+        channel_bot = telebot.TeleBot(self.config.telegram_token, threaded=False)
+        interactive_bot = AsyncTeleBot(self.config.telegram_token, exception_handler=LongPollTimeoutHandler())
+        
+        self.telegram_bot = TelegramBot(
+            channel_bot,
+            self.config.channel_id,
+            retry_attempts=self.config.retry_attempts,
+            retry_delay=self.config.retry_delay
+        )
         self.content_generator = IslamicContentGenerator()
         self.scheduler = ContentScheduler(self.telegram_bot, self.content_generator)
-        self.azkar_counter = AzkarCounter(self.config.telegram_token)
+        self.azkar_counter = AzkarCounter(interactive_bot)
         self.bot_handler = CombinedBotHandler(
-            self.config.telegram_token, 
+            interactive_bot, 
             self.config.channel_id, 
             self.scheduler, 
-            self.azkar_counter
+            self.azkar_counter,
+            loop,
+            polling_timeout=self.config.polling_timeout
         )
         self.running = False
         
+        # Setup signal handlers once (but ignore shutdown signals)
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+        
     def start(self):
         """Start the bot with both scheduled content and interactive features - NEVER STOPS"""
         # Run forever - never give up, never shut down
@@ -63,27 +86,21 @@ class IslamicTelegramBot:
                     time.sleep(30)
                     continue
                 
-                # Setup signal handlers (but ignore shutdown signals)
-                signal.signal(signal.SIGINT, self._signal_handler)
-                signal.signal(signal.SIGTERM, self._signal_handler)
-                
                 logger.info("✅ Bot components initialized successfully!")
                 logger.info("📅 Starting scheduled content posting...")
                 logger.info("📿 Starting interactive azkar counter...")
                 logger.info(f"📤 Channel: {self.config.channel_id}")
                 
-                # Send startup notification
-                try:
-                    startup_message = "سبحان الله"
-                    self.telegram_bot.send_message(startup_message)
-                except Exception as e:
-                    logger.warning(f"⚠️ Could not send startup message: {e}")
-                
                 # Start interactive bot polling
                 self.bot_handler.start_bot_polling()
                 
-                # Start scheduler (runs in main thread)
-                self.bot_handler.start_scheduler()
+                # Send startup notification in the background - best effort, never delays startup
+                threading.Thread(target=self._send_startup_message, daemon=True).start()
+                
+                # Start scheduler in its own thread, keeping the main thread free
+                scheduler_thread = self.bot_handler.start_scheduler_in_thread()
+                while scheduler_thread.is_alive():
+                    scheduler_thread.join(timeout=3600)
                 
                 # If we reach here, something stopped the scheduler - restart
                 logger.error("❌ Scheduler stopped unexpectedly - restarting in 10 seconds...")
@@ -94,6 +111,14 @@ class IslamicTelegramBot:
                 time.sleep(30)
                 continue
     
+    def _send_startup_message(self):
+        """Send startup notification to the channel"""
+        try:
+            startup_message = "سبحان الله"
+            self.telegram_bot.send_message(startup_message)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not send startup message: {e}")
+    
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals - BUT NEVER ACTUALLY SHUTDOWN"""
         logger.info(f"📶 Received signal {signum} - IGNORING shutdown request! Bot will keep running...")
@@ -101,14 +126,27 @@ class IslamicTelegramBot:
 
 def main():
     """Main entry point - NEVER STOPS"""
-    # Start the keep alive server
-    keep_alive()
+    # One event loop thread hosts both the keep-alive server and the interactive bot
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    
+    # Bind the keep-alive port first, before any validation or connection checks.
+    # Read the flag directly so a malformed config value can't stop the bind.
+    if os.getenv("KEEP_ALIVE", "true").lower() == "true":
+        try:
+            # Never read: holds the runner for the life of the process so the port is bound only once
+            keep_alive_runner = asyncio.run_coroutine_threadsafe(keep_alive(), loop).result(timeout=30)  # noqa: F841
+            logger.info("✅ Keep-alive server started")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not start keep-alive server: {e}")
     
     # Run forever - never exit under any circumstances
+    bot = None
     while True:
         try:
-            # Start the Islamic bot
-            bot = IslamicTelegramBot()
+            # Build the Islamic bot once, then only retry starting it
+            if bot is None:
+                bot = IslamicTelegramBot(loop)
             bot.start()  # This will also run forever
         except KeyboardInterrupt:
             logger.info("📶 Ignoring keyboard interrupt - Bot will continue running!")
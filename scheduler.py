@@ -3,19 +3,30 @@ Content Scheduler
 Handles timing and scheduling of content posts
 """
 
-import schedule
+import sched
+import threading
 import time
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
 from logger_config import setup_logger
 
 logger = setup_logger()
 
 class ContentScheduler:
-    def __init__(self, telegram_bot, content_generator):
+    def __init__(self, telegram_bot, content_generator, batch_flush_interval=3, max_buffer_size=20000):
         """Initialize scheduler with bot and content generator"""
         self.telegram_bot = telegram_bot
         self.content_generator = content_generator
-        self.scheduled_jobs = []
+        self.sched = sched.scheduler(time.time, time.sleep)
+        self.scheduled_jobs = {}  # content_type -> time_str
+        
+        # Outgoing posts are buffered and flushed in order by a background thread
+        self.batch_flush_interval = batch_flush_interval
+        self.max_buffer_size = max_buffer_size
+        self._pending = deque()
+        self._pending_lock = threading.Lock()
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
         
         # Default schedule times (can be overridden by config)
         self.default_schedule = {
@@ -36,15 +47,15 @@ class ContentScheduler:
         logger.info("📅 Setting up content schedule...")
         
         # Clear existing jobs
-        schedule.clear()
+        for event in self.sched.queue:
+            self.sched.cancel(event)
+        self.scheduled_jobs.clear()
         
         # Schedule each content type
         for content_type, time_str in schedule_times.items():
             try:
-                job = schedule.every().day.at(time_str).do(
-                    self._generate_and_send_content, content_type
-                )
-                self.scheduled_jobs.append((content_type, time_str, job))
+                self._schedule_daily(content_type, time_str)
+                self.scheduled_jobs[content_type] = time_str
                 logger.info(f"   📍 {content_type} scheduled at {time_str}")
             except Exception as e:
                 logger.error(f"❌ Failed to schedule {content_type} at {time_str}: {e}")
@@ -53,11 +64,34 @@ class ContentScheduler:
         self._log_next_runs()
     
     def run_pending_tasks(self):
-        """Run any pending scheduled tasks"""
+        """Run any due scheduled tasks and return the seconds until the next one (None if none)"""
         try:
-            schedule.run_pending()
+            return self.sched.run(blocking=False)
         except Exception as e:
             logger.error(f"❌ Error running scheduled tasks: {e}")
+            return None
+    
+    def _schedule_daily(self, content_type, time_str):
+        """Schedule the next daily run of content_type at time_str (HH:MM)"""
+        self.sched.enterabs(
+            self._next_occurrence(time_str), 1, self._run_daily_job, (content_type, time_str)
+        )
+    
+    def _run_daily_job(self, content_type, time_str):
+        """Run a daily job and schedule it again for tomorrow"""
+        # Re-arm first so a failing run never drops the job from the schedule
+        self._schedule_daily(content_type, time_str)
+        self._generate_and_send_content(content_type)
+    
+    @staticmethod
+    def _next_occurrence(time_str):
+        """Get the timestamp of the next local occurrence of time_str (HH:MM)"""
+        hour, minute = (int(part) for part in time_str.split(":"))
+        now = datetime.now()
+        run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        return run_at.timestamp()
     
     def _generate_and_send_content(self, content_type):
         """Generate and send content for the specified type"""
@@ -69,54 +103,72 @@ class ContentScheduler:
             content = self.content_generator.generate_content(content_type)
             
             if content:
-                # Send to Telegram
-                success = self.telegram_bot.send_formatted_content(content_type, content)
-                
-                if success:
-                    logger.info(f"✅ Successfully posted {content_type}")
-                else:
-                    logger.error(f"❌ Failed to post {content_type}")
+                # Queue for the next batch flush to Telegram
+                self._enqueue(content_type, content)
             else:
                 logger.error(f"❌ No content generated for {content_type}")
                 
         except Exception as e:
             logger.error(f"❌ Error in scheduled task {content_type}: {e}")
     
+    def _enqueue(self, content_type, content):
+        """Buffer a post, dropping the oldest ones if the buffer grows too large"""
+        with self._pending_lock:
+            self._pending.append((content_type, content))
+            buffered = sum(len(c) for _, c in self._pending)
+            while buffered > self.max_buffer_size and len(self._pending) > 1:
+                dropped_type, dropped_content = self._pending.popleft()
+                buffered -= len(dropped_content)
+                logger.warning(f"⚠️ Send buffer full - dropped queued {dropped_type}")
+        logger.info(f"📥 Queued {content_type} for posting")
+    
+    def _flush_loop(self):
+        """Drain buffered posts every batch_flush_interval seconds - NEVER STOPS"""
+        while True:
+            time.sleep(self.batch_flush_interval)
+            try:
+                self._flush_pending()
+            except Exception as e:
+                logger.error(f"❌ Error flushing queued posts: {e}")
+    
+    def _flush_pending(self):
+        """Send all buffered posts in order, paced under Telegram's rate limit"""
+        with self._pending_lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        
+        for i, (content_type, content) in enumerate(batch):
+            if i:
+                time.sleep(1 / 30)  # Stay under Telegram's 30 messages/second limit
+            
+            success = self.telegram_bot.send_formatted_content(content_type, content)
+            
+            if success:
+                logger.info(f"✅ Successfully posted {content_type}")
+            else:
+                logger.error(f"❌ Failed to post {content_type}")
+    
     def _log_next_runs(self):
         """Log the next scheduled runs"""
         logger.info("🔜 Next scheduled posts:")
         
-        # Get all jobs sorted by next run time
-        jobs_info = []
-        for job in schedule.jobs:
-            next_run = job.next_run
-            if next_run:
-                # Find the content type for this job
-                content_type = "unknown"
-                for ct, time_str, scheduled_job in self.scheduled_jobs:
-                    if scheduled_job == job:
-                        content_type = ct
-                        break
-                
-                jobs_info.append((next_run, content_type))
-        
-        jobs_info.sort(key=lambda x: x[0])
-        
-        for next_run, content_type in jobs_info[:3]:  # Show next 3 runs
-            formatted_time = next_run.strftime("%Y-%m-%d %H:%M")
+        # The sched queue is already ordered by next run time
+        for event in self.sched.queue[:3]:  # Show next 3 runs
+            content_type = event.argument[0]
+            formatted_time = datetime.fromtimestamp(event.time).strftime("%Y-%m-%d %H:%M")
             logger.info(f"   📍 {content_type}: {formatted_time}")
     
     def get_schedule_status(self):
         """Get current schedule status"""
+        queue = self.sched.queue
         status = {
-            "total_jobs": len(schedule.jobs),
+            "total_jobs": len(queue),
             "scheduled_content_types": len(self.scheduled_jobs),
             "next_run": None
         }
         
-        if schedule.jobs:
-            next_job = min(schedule.jobs, key=lambda x: x.next_run)
-            status["next_run"] = next_job.next_run.strftime("%Y-%m-%d %H:%M:%S")
+        if queue:
+            status["next_run"] = datetime.fromtimestamp(queue[0].time).strftime("%Y-%m-%d %H:%M:%S")
         
         return status
     
@@ -3,20 +3,51 @@ Telegram Bot Handler
 Manages communication with Telegram API
 """
 
+import random
+import re
 import time
-import telebot
+import requests
+from requests.adapters import HTTPAdapter
+from telebot import apihelper
 from telebot.apihelper import ApiTelegramException
 from logger_config import setup_logger
 
 logger = setup_logger()
 
+# Share one keep-alive connection pool across all synchronous Telegram API calls
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+apihelper.session = _session
+apihelper.CONNECT_TIMEOUT = 10
+apihelper.READ_TIMEOUT = 40
+
+# Content type specific formatting
+_EMOJI_MAP = {
+    "morning_azkar": "🌅",
+    "evening_azkar": "🌙",
+    "quran_verse": "📖",
+    "daily_hadith": "📚",
+    "daily_dua": "🤲",
+    "daily_reminder": "💭"
+}
+
+# Arabic titles for content types
+_TITLES = {
+    "morning_azkar": "أذكار الصباح",
+    "evening_azkar": "أذكار المساء",
+    "quran_verse": "آية من القرآن الكريم",
+    "daily_hadith": "حديث شريف",
+    "daily_dua": "دعاء مستجاب",
+    "daily_reminder": "تذكرة إيمانية"
+}
+
 class TelegramBot:
-    def __init__(self, token, channel_id):
-        """Initialize Telegram bot with token and channel ID"""
-        self.bot = telebot.TeleBot(token)
+    def __init__(self, bot, channel_id, retry_attempts=3, retry_delay=60):
+        """Initialize Telegram bot with a synchronous TeleBot and channel ID"""
+        self.bot = bot
         self.channel_id = channel_id
-        self.retry_attempts = 3
-        self.retry_delay = 60
+        self.retry_attempts = retry_attempts
+        self.retry_delay = retry_delay  # Upper bound for the exponential backoff
     
     def test_connection(self):
         """Test Telegram bot connection"""
@@ -49,16 +80,45 @@ class TelegramBot:
             logger.error(f"❌ Unexpected error testing connection: {e}")
             return False
     
-    def send_message(self, message, retry_count=0):
-        """Send message to the configured channel with retry logic"""
+    def send_message(self, message):
+        """Send message to the configured channel, split into parts if it is too long"""
+        parts = self._split(message)
+        if not parts:
+            logger.error("❌ Cannot send empty message")
+            return False
+        if len(parts) > 1:
+            logger.info(f"✂️ Message split into {len(parts)} parts to fit Telegram limit")
+        
+        # Stop at the first failed part so the channel never sees them out of order
+        return all(self._send_part(part) for part in parts)
+    
+    def _split(self, text, limit=4096):
+        """Split text at paragraph boundaries into chunks of at most limit characters"""
+        parts, buf = [], ""
+        for para in text.split("\n\n"):
+            # A single paragraph longer than the limit has to be cut
+            while len(para) > limit:
+                if buf:
+                    parts.append(buf)
+                    buf = ""
+                parts.append(para[:limit])
+                para = para[limit:]
+            
+            if buf and len(buf) + len(para) + 2 > limit:
+                parts.append(buf)
+                buf = para
+            else:
+                buf = f"{buf}\n\n{para}" if buf else para
+        
+        if buf:
+            parts.append(buf)
+        return parts
+    
+    def _send_part(self, message, retry_count=0):
+        """Send a single message part to the configured channel with retry logic"""
         try:
             logger.info(f"📤 Sending message to {self.channel_id}...")
             
-            # Split long messages if needed
-            if len(message) > 4096:
-                message = message[:4090] + "..."
-                logger.warning("⚠️ Message truncated to fit Telegram limit")
-            
             self.bot.send_message(
                 chat_id=self.channel_id,
                 text=message,
@@ -74,12 +134,14 @@ class TelegramBot:
             
             # Handle rate limiting
             if "too many requests" in error_msg:
-                wait_time = 60  # Default wait time
+                # Honour Telegram's retry_after hint when present
+                match = re.search(r"retry after (\d+)", error_msg)
+                wait_time = int(match.group(1)) if match else self._backoff_delay(retry_count)
                 logger.warning(f"⏳ Rate limited. Waiting {wait_time} seconds...")
                 time.sleep(wait_time)
                 
                 if retry_count < self.retry_attempts:
-                    return self.send_message(message, retry_count + 1)
+                    return self._send_part(message, retry_count + 1)
                 else:
                     logger.error("❌ Failed to send message after rate limit retries")
                     return False
@@ -90,8 +152,8 @@ class TelegramBot:
                 
                 if retry_count < self.retry_attempts:
                     logger.info(f"🔄 Retrying... Attempt {retry_count + 1}/{self.retry_attempts}")
-                    time.sleep(self.retry_delay)
-                    return self.send_message(message, retry_count + 1)
+                    time.sleep(self._backoff_delay(retry_count))
+                    return self._send_part(message, retry_count + 1)
                 else:
                     logger.error("❌ Failed to send message after timeout retries")
                     return False
@@ -107,8 +169,8 @@ class TelegramBot:
                 
                 if retry_count < self.retry_attempts:
                     logger.info(f"🔄 Retrying... Attempt {retry_count + 1}/{self.retry_attempts}")
-                    time.sleep(self.retry_delay)
-                    return self.send_message(message, retry_count + 1)
+                    time.sleep(self._backoff_delay(retry_count))
+                    return self._send_part(message, retry_count + 1)
                 else:
                     logger.error("❌ Failed to send message after all retries")
                     return False
@@ -117,23 +179,17 @@ class TelegramBot:
             logger.error(f"❌ Unexpected error while sending message: {e}")
             return False
     
+    def _backoff_delay(self, retry_count):
+        """Exponential backoff with jitter, capped at retry_delay seconds"""
+        return min(self.retry_delay, 2 ** retry_count) + random.uniform(0, 1)
+    
     def send_formatted_content(self, content_type, content):
         """Send formatted content with appropriate emojis and formatting"""
         if not content:
             logger.error("❌ Cannot send empty content")
             return False
         
-        # Add content type specific formatting
-        emoji_map = {
-            "morning_azkar": "🌅",
-            "evening_azkar": "🌙",
-            "quran_verse": "📖",
-            "daily_hadith": "📚",
-            "daily_dua": "🤲",
-            "daily_reminder": "💭"
-        }
-        
-        emoji = emoji_map.get(content_type, "🕌")
+        emoji = _EMOJI_MAP.get(content_type, "🕌")
         
         # Format the message
         formatted_message = f"{emoji} <b>{self._get_content_title(content_type)}</b>\n\n{content}"
@@ -142,15 +198,7 @@ class TelegramBot:
     
     def _get_content_title(self, content_type):
         """Get Arabic title for content type"""
-        titles = {
-            "morning_azkar": "أذكار الصباح",
-            "evening_azkar": "أذكار المساء",
-            "quran_verse": "آية من القرآن الكريم",
-            "daily_hadith": "حديث شريف",
-            "daily_dua": "دعاء مستجاب",
-            "daily_reminder": "تذكرة إيمانية"
-        }
-        return titles.get(content_type, "محتوى إسلامي")
+        return _TITLES.get(content_type, "محتوى إسلامي")
     
     def get_bot_info(self):
         """Get bot information"""
@@ -4,6 +4,7 @@ Quick test script to check bot connection
 """
 
 import os
+import telebot
 from telegram_bot import TelegramBot
 from logger_config import setup_logger
 
@@ -18,7 +19,7 @@ def test_bot_connection():
         logger.error("Missing credentials")
         return False
     
-    bot = TelegramBot(token, channel_id)
+    bot = TelegramBot(telebot.TeleBot(token, threaded=False), channel_id)
     
     # Test connection
     if bot.test_connection():